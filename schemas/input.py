@@ -1,6 +1,12 @@
+import os
+import stat
+import time
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from pydantic import BaseModel, field_validator, ValidationError
+from pydantic import BaseModel, field_validator
+
+__all__ = ["Ecosystem", "DependencyHealthInput"]
 
 
 class Ecosystem(str, Enum):
@@ -12,6 +18,7 @@ class Ecosystem(str, Enum):
 class DependencyHealthInput(BaseModel):
     project_path: str
     ecosystem: Ecosystem = Ecosystem.auto
+    include_metadata: bool = True  # False skips changelogs/release dates for a quicker version-only check
 
     @field_validator("project_path")
     @classmethod
@@ -33,20 +40,34 @@ class DependencyHealthInput(BaseModel):
         if not v:
             raise ValueError("project_path cannot be empty")
         
-        # Convert to Path object and resolve to absolute path
-        # This also normalizes the path and resolves symlinks
-        try:
-            path = Path(v).resolve()
-        except (OSError, RuntimeError) as e:
-            raise ValueError(f"Invalid path: {e}")
-        
-        # Check if path exists
-        if not path.exists():
-            raise ValueError(f"Path does not exist: {v}")
-        
-        # Check if it's a directory
-        if not path.is_dir():
-            raise ValueError(f"Path is not a directory: {v}")
-        
-        # Return the resolved absolute path as a string
-        return str(path)
+        # Resolved paths are memoized per minute so repeated calls skip the filesystem,
+        # while a directory deleted in the meantime is noticed on the next bucket
+        return _resolve_and_check(v, int(time.monotonic() // 60))
+
+
+@lru_cache(maxsize=256)
+def _resolve_and_check(v: str, _bucket: int) -> str:
+    """
+    Resolves v to an absolute directory path, raising ValueError if it is not one.
+
+    _bucket only participates in the cache key; failures are never cached.
+    """
+    # Convert to Path object and resolve to absolute path
+    # This also normalizes the path and resolves symlinks
+    try:
+        path = Path(v).resolve()
+    except (OSError, RuntimeError) as e:
+        raise ValueError(f"Invalid path: {e}")
+    
+    # One stat call covers both the existence and the directory check
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise ValueError(f"Path does not exist: {v}")
+    except OSError as e:
+        raise ValueError(f"Invalid path: {e}")
+    if not stat.S_ISDIR(st.st_mode):
+        raise ValueError(f"Path is not a directory: {v}")
+    
+    # Return the resolved absolute path as a string
+    return str(path)
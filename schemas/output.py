@@ -1,8 +1,12 @@
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+__all__ = ["DependencyResult", "DependencyHealthOutput"]
 
 
 class DependencyResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", validate_assignment=False)
+
     name: str
     current: str
     latest: str
@@ -15,4 +19,6 @@ class DependencyResult(BaseModel):
 
 
 class DependencyHealthOutput(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", validate_assignment=False)
+
     dependencies: List[DependencyResult]
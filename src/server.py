@@ -1,105 +1,183 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 
 from mcp.server.fastmcp import FastMCP
+from pydantic import TypeAdapter
 
 from schemas.input import DependencyHealthInput, Ecosystem
-from schemas.output import DependencyHealthOutput, DependencyResult
+from schemas.output import DependencyResult
 
 from utils.file_finder import find_dependency_files
 from utils.parsers import parse_package_json, parse_requirements_txt
-from utils.versions import is_prerelease, is_up_to_date
+from utils.registry_cache import get_or_fetch
+from utils.versions import is_prerelease, is_up_to_date_batch
 
-from src.services.registry_clients import fetch_npm_latest, fetch_pypi_latest
+from src.services.registry_clients import RegistryResult, aclose_client, fetch_npm_latest, fetch_pypi_latest
 from src.services.error_handlers import handle_registry_error
 
 
-mcp = FastMCP("Dependency Health Checker MCP")
+# Sessions currently inside lifespan(); SSE / streamable HTTP enter it once per session
+_active_sessions = 0
 
 
-async def check_javascript_dependencies(package_json_path) -> List[DependencyResult]:
+@asynccontextmanager
+async def lifespan(_server: FastMCP) -> AsyncIterator[dict]:
+    """
+    Closes the shared registry HTTP client once the last open session ends.
+
+    Under stdio this runs once for the whole server. HTTP transports run it per session,
+    so the client is reference-counted rather than closed under other sessions' requests;
+    it is recreated on demand if a new session starts later.
+    """
+    global _active_sessions
+    _active_sessions += 1
+    try:
+        yield {}
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            await aclose_client()
+
+
+mcp = FastMCP("Dependency Health Checker MCP", lifespan=lifespan)
+
+# Dumps the whole result list in one pydantic-core call; FastMCP then JSON-encodes it in Rust
+_RESULTS_ADAPTER = TypeAdapter(List[DependencyResult])
+
+
+async def _fetch_registry(
+    ecosystem: str,
+    name: str,
+    fetcher: Callable[..., Awaitable[RegistryResult]],
+    include_metadata: bool = True,
+) -> RegistryResult:
+    """
+    Fetches registry data for a package through the shared TTL cache.
+
+    The cache also coalesces concurrent lookups, so a package requested twice
+    while its first request is in flight costs a single registry call.
+    """
+    return await get_or_fetch(
+        (ecosystem, name, include_metadata),
+        lambda: fetcher(name, include_metadata=include_metadata),
+    )
+
+
+def _build_result(name: str, current: str, reg: RegistryResult, ok: bool, cmp_note: Optional[str]) -> DependencyResult:
+    """
+    Assembles the result for a dependency whose registry lookup succeeded.
+    """
+    latest = reg.latest
+    pre_note = f"{latest} is pre-release (from registry)" if is_prerelease(latest) else None
+    note = "; ".join(p for p in (reg.note, pre_note, cmp_note) if p) or None
+
+    # Every field is built here from registry data, so skip Pydantic re-validation
+    return DependencyResult.model_construct(
+        name=name,
+        current=current,
+        latest=latest,
+        status="up-to-date" if ok else "outdated",
+        note=note,
+        release_date=reg.release_date,
+        changelog_content=reg.changelog_content,
+        description=reg.description,
+    )
+
+
+async def check_javascript_dependencies(package_json_path, include_metadata: bool = True) -> List[DependencyResult]:
     """
     Checks JavaScript dependencies defined in package.json.
     """
-    deps = parse_package_json(package_json_path)
-    
-    async def check_single_dependency(name: str, current: str) -> DependencyResult:
+    deps = await asyncio.to_thread(parse_package_json, package_json_path)
+
+    # Fetch every package concurrently; failures come back as exceptions instead of cancelling siblings
+    regs = await asyncio.gather(
+        *(_fetch_registry("npm", name, fetch_npm_latest, include_metadata) for name in deps),
+        return_exceptions=True,
+    )
+
+    # Compare every fetched version in one pass, keyed by (spec, latest) so lookups can't drift out of line
+    pairs = [(current, reg.latest) for current, reg in zip(deps.values(), regs) if not isinstance(reg, Exception)]
+    checks = dict(zip(pairs, is_up_to_date_batch(pairs)))
+
+    results: List[DependencyResult] = []
+    for (name, current), reg in zip(deps.items(), regs):
+        if isinstance(reg, Exception):
+            results.append(handle_registry_error(name, current, reg, "npm"))
+            continue
+        check = checks[(current, reg.latest)]
+        if isinstance(check, Exception):
+            results.append(handle_registry_error(name, current, check, "npm"))
+            continue
+        ok, cmp_note = check
         try:
-            reg = await fetch_npm_latest(name)
-            latest = reg.latest
-
-            note_parts = []
-            if reg.note:
-                note_parts.append(reg.note)
-            if is_prerelease(latest):
-                note_parts.append(f"{latest} is pre-release (from registry)")
-
-            ok, cmp_note = is_up_to_date(current, latest)
-            if cmp_note:
-                note_parts.append(cmp_note)
-
-            return DependencyResult(
-                name=name,
-                current=current,
-                latest=latest,
-                status="up-to-date" if ok else "outdated",
-                note="; ".join(note_parts) or None,
-                release_date=reg.release_date,
-                changelog_content=reg.changelog_content,
-                description=reg.description,
-            )
+            results.append(_build_result(name, current, reg, ok, cmp_note))
         except Exception as e:
-            return handle_registry_error(name, current, e, "npm")
-    
-    # Run all dependency checks in parallel
-    tasks = [check_single_dependency(name, current) for name, current in deps.items()]
-    results = await asyncio.gather(*tasks)
-    
-    return list(results)
+            results.append(handle_registry_error(name, current, e, "npm"))
 
+    return results
 
-async def check_python_dependencies(requirements_path) -> List[DependencyResult]:
+
+async def check_python_dependencies(requirements_path, include_metadata: bool = True) -> List[DependencyResult]:
     """
     Checks Python dependencies defined in requirements.txt.
     """
-    deps = parse_requirements_txt(requirements_path)
-    
-    async def check_single_dependency(name: str, spec: str) -> DependencyResult:
+    deps = await asyncio.to_thread(parse_requirements_txt, requirements_path)
+
+    # requirements.txt may list a package more than once; fetch each name once and project back
+    unique_names = list(dict.fromkeys(name for name, _ in deps))
+
+    # Fetch every package concurrently; failures come back as exceptions instead of cancelling siblings
+    regs = await asyncio.gather(
+        *(_fetch_registry("pypi", name, fetch_pypi_latest, include_metadata) for name in unique_names),
+        return_exceptions=True,
+    )
+    regs_by_name = dict(zip(unique_names, regs))
+
+    # Compare every pinned spec in one pass, keyed by (spec, latest) so lookups can't drift out of line
+    pairs = [
+        (spec, regs_by_name[name].latest)
+        for name, spec in deps
+        if spec and not isinstance(regs_by_name[name], Exception)
+    ]
+    checks = dict(zip(pairs, is_up_to_date_batch(pairs)))
+
+    results: List[DependencyResult] = []
+    for name, spec in deps:
+        reg = regs_by_name[name]
         current = f"{name}{spec}" if spec else name
+        if isinstance(reg, Exception):
+            results.append(handle_registry_error(name, current, reg, "PyPI"))
+            continue
+        check = checks[(spec, reg.latest)] if spec else (False, "no pinned version")
+        if isinstance(check, Exception):
+            results.append(handle_registry_error(name, current, check, "PyPI"))
+            continue
+        ok, cmp_note = check
         try:
-            reg = await fetch_pypi_latest(name)
-            latest = reg.latest
-
-            note_parts = []
-            if reg.note:
-                note_parts.append(reg.note)
-            if is_prerelease(latest):
-                note_parts.append(f"{latest} is pre-release (from registry)")
-
-            ok, cmp_note = is_up_to_date(spec or "", latest) if spec else (False, "no pinned version")
-            if cmp_note:
-                note_parts.append(cmp_note)
-
-            return DependencyResult(
-                name=name,
-                current=current,
-                latest=latest,
-                status="up-to-date" if ok else "outdated",
-                note="; ".join(note_parts) or None,
-                release_date=reg.release_date,
-                changelog_content=reg.changelog_content,
-                description=reg.description,
-            )
+            results.append(_build_result(name, current, reg, ok, cmp_note))
         except Exception as e:
-            return handle_registry_error(name, current, e, "PyPI")
-    
-    # Run all dependency checks in parallel
-    tasks = [check_single_dependency(name, spec) for name, spec in deps]
-    results = await asyncio.gather(*tasks)
-    
-    return list(results)
+            results.append(handle_registry_error(name, current, e, "PyPI"))
+
+    return results
+
+
+# Ecosystem -> (manifest picker, checker); insertion order is the auto-detection priority
+_CHECKERS = {
+    Ecosystem.javascript: (lambda files: files["package_json"], check_javascript_dependencies),
+    Ecosystem.python: (lambda files: files["requirements_txt"], check_python_dependencies),
+}
+
+
+# Manifests worth probing for each requested ecosystem
+_WANTED_FILES = {
+    Ecosystem.auto: {"package_json", "requirements_txt"},
+    Ecosystem.javascript: {"package_json"},
+    Ecosystem.python: {"requirements_txt"},
+}
 
 
 @mcp.tool()
@@ -112,6 +190,8 @@ Other package managers (Poetry, Pipenv, Cargo, Go modules, Maven, Gradle, Compos
 
 Returns for each dependency: name, current version, latest version, status, changelog_content
 (actual release notes or explanatory message), description, and release_date.
+Pass include_metadata=false for a quicker version-only check that skips changelogs,
+descriptions and release dates.
 
 **When to use this tool:**
 - User asks about dependency versions/updates in a specific project
@@ -133,24 +213,22 @@ implications—not just version differences.
     # Validate and normalize input
     inp = DependencyHealthInput(**payload)
 
-    # Locate dependency files
-    files = find_dependency_files(inp.project_path)
+    # Locate dependency files (off the event loop so in-flight registry calls keep progressing),
+    # probing only the manifests the requested ecosystem can use
+    files = await asyncio.to_thread(find_dependency_files, inp.project_path, _WANTED_FILES[inp.ecosystem])
 
     # Decide ecosystem
     eco = inp.ecosystem
     if eco == Ecosystem.auto:
-        if files["package_json"]:
-            eco = Ecosystem.javascript
-        elif files["requirements_txt"]:
-            eco = Ecosystem.python
+        eco = next((e for e, (picker, _) in _CHECKERS.items() if picker(files)), eco)
 
-    results: List[DependencyResult] = []
+    picker, checker = _CHECKERS.get(eco, (None, None))
+    manifest = picker(files) if picker else None
 
-    if eco == Ecosystem.javascript and files["package_json"]:
-        results = await check_javascript_dependencies(files["package_json"])
+    results: List[DependencyResult] = []
 
-    elif eco == Ecosystem.python and files["requirements_txt"]:
-        results = await check_python_dependencies(files["requirements_txt"])
+    if manifest:
+        results = await checker(manifest, inp.include_metadata)
 
     else:
         # No supported dependency file found
@@ -167,14 +245,20 @@ implications—not just version differences.
             )
         )
 
-    out = DependencyHealthOutput(dependencies=results)
-    return out.model_dump()
+    # Same shape as DependencyHealthOutput.model_dump(), without re-validating every result
+    return {"dependencies": _RESULTS_ADAPTER.dump_python(results, exclude_none=True)}
 
 
 def main() -> None:
     """
     Entry point for the MCP server. Starts the FastMCP server in stdio mode.
+    Uses uvloop when installed (the optional "uvloop" extra) for cheaper task scheduling.
     """
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     mcp.run()
 
 
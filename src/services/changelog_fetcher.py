@@ -1,68 +1,115 @@
 from __future__ import annotations
 from typing import Optional
 import httpx
+import orjson
 import re
 
 
-async def fetch_changelog_content(changelog_url: Optional[str], version: str) -> str:
+_GITHUB_REPO_RE = re.compile(r"github\.com/([^/]+)/([^/]+)")
+
+# GitHub releases API URL -> (ETag, parsed releases); a 304 reuses the releases without a body
+_GITHUB_RELEASES_CACHE: dict[str, tuple[str, list]] = {}
+_GITHUB_RELEASES_MAXSIZE = 512  # oldest repositories are evicted beyond this many
+
+# Only the newest releases are ever matched against, so that's all that is parsed and cached
+_RECENT_RELEASES = 10
+
+# Changelog pages are slower than the registry APIs, so they get a longer per-request timeout
+_CHANGELOG_TIMEOUT = 15
+
+
+async def fetch_changelog_content(changelog_url: Optional[str], version: str, client: Optional[httpx.AsyncClient] = None) -> str:
     """
     Attempts to fetch changelog/release notes content from a given URL.
     Supports GitHub releases and tries to extract relevant release notes.
     Always returns a meaningful string for LLM consumption.
+    Pass a shared client to reuse pooled connections; otherwise a short-lived one is created.
     """
     if not changelog_url:
         return "Changelog could not be fetched automatically. No official changelog source was found."
+
+    if client is None:
+        async with httpx.AsyncClient(timeout=_CHANGELOG_TIMEOUT, follow_redirects=True) as own_client:
+            return await fetch_changelog_content(changelog_url, version, own_client)
     
     try:
-        async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
-            # GitHub releases page - try API first
-            if "github.com" in changelog_url and "/releases" in changelog_url:
-                # Extract owner/repo from URL
-                match = re.search(r"github\.com/([^/]+)/([^/]+)", changelog_url)
-                if match:
-                    owner, repo = match.groups()
-                    repo = repo.replace("/releases", "")
-                    
-                    # Try GitHub API to get latest release
-                    api_url = f"https://api.github.com/repos/{owner}/{repo}/releases"
-                    try:
-                        response = await client.get(api_url, headers={"Accept": "application/vnd.github+json"})
-                        if response.status_code == 200:
-                            releases = response.json()
-                            # Find release matching the version
-                            for release in releases[:10]:  # Check last 10 releases
-                                tag_name = release.get("tag_name", "")
-                                release_name = release.get("name", "")
-                                # Match version with or without 'v' prefix
-                                if version in tag_name or version in release_name or tag_name.lstrip("v") == version:
-                                    body = release.get("body", "")
-                                    if body:
-                                        # Truncate if too long
-                                        max_length = 2000
-                                        if len(body) > max_length:
-                                            body = body[:max_length] + "\n\n... (truncated)"
-                                        return f"Release {tag_name or release_name}:\n\n{body}"
-                            
-                            # If no exact match, return the latest release
-                            if releases:
-                                latest_release = releases[0]
-                                body = latest_release.get("body", "")
-                                if body:
-                                    max_length = 2000
-                                    if len(body) > max_length:
-                                        body = body[:max_length] + "\n\n... (truncated)"
-                                    tag_name = latest_release.get("tag_name", "")
-                                    return f"Latest Release {tag_name} (Note: Exact match for version {version} not found, showing latest release instead):\n\n{body}"
-                    except Exception:
-                        pass  # Fall back to scraping HTML
-            
-            # Fallback: Try to fetch the HTML page (for non-GitHub or if API fails)
-            # This is a basic fallback - won't parse complex pages well
-            response = await client.get(changelog_url)
-            if response.status_code == 200:
-                # Indicate that changelog exists at URL but couldn't be parsed
-                return f"Changelog available at: {changelog_url}\n\nThe release notes exist but could not be automatically extracted. Visit the URL above for full details."
-            
+        # GitHub releases page - try API first
+        if "github.com" in changelog_url and "/releases" in changelog_url:
+            # Extract owner/repo from URL
+            match = _GITHUB_REPO_RE.search(changelog_url)
+            if match:
+                owner, repo = match.groups()
+                repo = repo.replace("/releases", "")
+                
+                # Try GitHub API to get latest release
+                api_url = f"https://api.github.com/repos/{owner}/{repo}/releases"
+                cached = _GITHUB_RELEASES_CACHE.get(api_url)
+                headers = {"Accept": "application/vnd.github+json"}
+                if cached:
+                    headers["If-None-Match"] = cached[0]
+                try:
+                    response = await client.get(
+                        api_url,
+                        headers=headers,
+                        timeout=_CHANGELOG_TIMEOUT,
+                        follow_redirects=True,
+                    )
+                    releases = None
+                    if response.status_code == 304 and cached:
+                        releases = cached[1]
+                    elif response.status_code == 200:
+                        releases = orjson.loads(response.content)[:_RECENT_RELEASES]
+                        etag = response.headers.get("ETag")
+                        if etag:
+                            _GITHUB_RELEASES_CACHE.pop(api_url, None)
+                            _GITHUB_RELEASES_CACHE[api_url] = (etag, releases)
+                            while len(_GITHUB_RELEASES_CACHE) > _GITHUB_RELEASES_MAXSIZE:
+                                del _GITHUB_RELEASES_CACHE[next(iter(_GITHUB_RELEASES_CACHE))]
+                    if releases is not None:
+                        # Find release matching the version among the newest releases
+                        by_tag = {release.get("tag_name", ""): release for release in releases}
+                        # Exact tag (with or without 'v' prefix) first, then substring match on tag or name
+                        candidates = [by_tag.get(version), by_tag.get(f"v{version}")]
+                        candidates += [
+                            release for release in releases
+                            if version in release.get("tag_name", "") or version in (release.get("name") or "")
+                        ]
+                        for release in candidates:
+                            body = release.get("body", "") if release else ""
+                            if body:
+                                # Truncate if too long
+                                max_length = 2000
+                                if len(body) > max_length:
+                                    body = body[:max_length] + "\n\n... (truncated)"
+                                return f"Release {release.get('tag_name') or release.get('name')}:\n\n{body}"
+                        
+                        # If no exact match, return the latest release
+                        if releases:
+                            latest_release = releases[0]
+                            body = latest_release.get("body", "")
+                            if body:
+                                max_length = 2000
+                                if len(body) > max_length:
+                                    body = body[:max_length] + "\n\n... (truncated)"
+                                tag_name = latest_release.get("tag_name", "")
+                                return f"Latest Release {tag_name} (Note: Exact match for version {version} not found, showing latest release instead):\n\n{body}"
+                except Exception:
+                    pass  # Fall back to scraping HTML
+        
+        # Fallback: check the changelog page exists (for non-GitHub or if API fails)
+        # The body is never parsed, so probe with HEAD; servers that reject HEAD get a 1-byte ranged GET
+        response = await client.head(changelog_url, timeout=_CHANGELOG_TIMEOUT, follow_redirects=True)
+        if response.status_code in (405, 501):
+            response = await client.get(
+                changelog_url,
+                headers={"Range": "bytes=0-0"},
+                timeout=_CHANGELOG_TIMEOUT,
+                follow_redirects=True,
+            )
+        if response.status_code in (200, 206):
+            # Indicate that changelog exists at URL but couldn't be parsed
+            return f"Changelog available at: {changelog_url}\n\nThe release notes exist but could not be automatically extracted. Visit the URL above for full details."
+        
     except Exception:
         # Return informative message with source link
         if changelog_url:
@@ -19,47 +19,31 @@ def handle_registry_error(name: str, current: str, error: Exception, registry_na
         
     Returns:
         DependencyResult with status "unknown" and appropriate error note
+        (built with model_construct: every field is produced here, so validation is skipped)
     """
     if isinstance(error, httpx.HTTPStatusError):
         # HTTP errors: 404 (not found), 500 (server error), etc.
+        changelog_content = f"Changelog could not be fetched. Package not found or unavailable in {registry_name} registry (HTTP {error.response.status_code})."
         note = f"HTTP {error.response.status_code}: package not found or unavailable"
-        return DependencyResult(
-            name=name,
-            current=current,
-            latest="unknown",
-            status="unknown",
-            changelog_content=f"Changelog could not be fetched. Package not found or unavailable in {registry_name} registry (HTTP {error.response.status_code}).",
-            note=note,
-        )
     elif isinstance(error, httpx.TimeoutException):
         # Request took longer than 10 seconds
-        return DependencyResult(
-            name=name,
-            current=current,
-            latest="unknown",
-            status="unknown",
-            changelog_content=f"Changelog could not be fetched. Request to {registry_name} registry timed out.",
-            note="Request timed out after 10 seconds",
-        )
+        changelog_content = f"Changelog could not be fetched. Request to {registry_name} registry timed out."
+        note = "Request timed out after 10 seconds"
     elif isinstance(error, httpx.RequestError):
         # Network/connection errors (DNS, connection refused, etc.)
-        return DependencyResult(
-            name=name,
-            current=current,
-            latest="unknown",
-            status="unknown",
-            changelog_content=f"Changelog could not be fetched. Network error connecting to {registry_name} registry.",
-            note=f"Network error: {type(error).__name__}",
-        )
+        changelog_content = f"Changelog could not be fetched. Network error connecting to {registry_name} registry."
+        note = f"Network error: {type(error).__name__}"
     else:
         # Catch truly unexpected errors and log them for debugging
         logger.error(f"Unexpected error querying {registry_name} for {name}: {error}", exc_info=True)
-        return DependencyResult(
-            name=name,
-            current=current,
-            latest="unknown",
-            status="unknown",
-            changelog_content=f"Changelog could not be fetched. An unexpected error occurred while querying {registry_name} registry.",
-            note=f"Unexpected error: {type(error).__name__}",
-        )
+        changelog_content = f"Changelog could not be fetched. An unexpected error occurred while querying {registry_name} registry."
+        note = f"Unexpected error: {type(error).__name__}"
 
+    return DependencyResult.model_construct(
+        name=name,
+        current=current,
+        latest="unknown",
+        status="unknown",
+        changelog_content=changelog_content,
+        note=note,
+    )
@@ -1,13 +1,19 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Dict, Optional, Sequence, Set, Tuple
+import asyncio
+import os
+import random
+import re
+from types import MappingProxyType
 import httpx
-from packaging.version import Version, InvalidVersion
+import orjson
 
 from src.services.changelog_fetcher import fetch_changelog_content
+from utils import registry_cache
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RegistryResult:
     latest: str
     changelog_content: str  # Always present - contains release notes or explanation text
@@ -16,40 +22,272 @@ class RegistryResult:
     description: Optional[str] = None
 
 
-async def fetch_npm_latest(package_name: str) -> RegistryResult:
+# Shared by every registry and changelog request so TCP+TLS setup is paid once per host
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide HTTP client, creating it on first use.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            # Registry JSON compresses 5-10x; br is decoded by the brotli extra
+            headers={"Accept-Encoding": "gzip, br"},
+            # npm, PyPI and GitHub negotiate HTTP/2, and the pool queues requests on a pending
+            # HTTP/2 connection instead of dialing more, so each of those hosts gets one multiplexed
+            # connection whatever this cap is. The cap is sized for HTTP/1.1-only changelog hosts;
+            # dropping it to a handful would serialize their probes without saving any handshakes
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            timeout=httpx.Timeout(10.0),
+        )
+    return _client
+
+
+async def aclose_client() -> None:
+    """
+    Closes the shared HTTP client, if one was created.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Shared read-only stand-in for missing JSON objects, so `x.get(k) or _EMPTY` never allocates
+_EMPTY = MappingProxyType({})
+
+# "git+" scheme prefixes and ".git" suffixes stripped from npm repository URLs
+_GIT_URL_NOISE_RE = re.compile(r"git\+|\.git")
+
+# Abbreviated packument: dist-tags and install fields only, 10-100x smaller than the full document
+_NPM_ABBREVIATED = "application/vnd.npm.install-v1+json"
+
+# PEP 691 JSON form of the Simple API; versions list per PEP 700
+_PYPI_SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+
+# changelog_content used when the caller opted out of metadata lookups
+_METADATA_SKIPPED = "Changelog not fetched: metadata lookup was skipped for this check."
+
+# Statuses npm/PyPI return transiently under load; retried up to _MAX_ATTEMPTS times in total
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_ATTEMPTS = 3
+_MAX_RETRY_DELAY = 8
+
+# registry -> (event loop, semaphore); shared by every tool invocation in the process
+_semaphores: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def _registry_semaphore(registry: str) -> asyncio.Semaphore:
+    """
+    Returns the semaphore bounding in-flight requests to one registry.
+
+    Created lazily so it binds to the running event loop; its size comes from
+    MCP_MAX_CONCURRENCY (default 16). Keeping the cap per registry stops a large
+    manifest from flooding npm or PyPI into HTTP 429s; changelog lookups (GitHub
+    API and page probes) are bounded the same way under the "changelog" key.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _semaphores.get(registry)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Semaphore(int(os.getenv("MCP_MAX_CONCURRENCY", "16"))))
+        _semaphores[registry] = entry
+    return entry[1]
+
+
+def _retry_delay(attempt: int, response: httpx.Response) -> float:
+    """
+    Seconds to wait before retrying a transient registry failure.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return min(float(retry_after), _MAX_RETRY_DELAY)
+        except ValueError:
+            pass  # HTTP-date form; use the backoff schedule instead
+    return min(2 ** attempt, _MAX_RETRY_DELAY) + random.random() * 0.3
+
+
+async def _fetch_changelog(changelog_url: Optional[str], version: str, client: httpx.AsyncClient) -> str:
+    """
+    fetch_changelog_content under the "changelog" concurrency slot.
+
+    Bounds how many GitHub API and changelog page-probe requests run at once; they all
+    multiplex over the shared HTTP/2 client, so the connection limit doesn't cap them.
+    """
+    async with _registry_semaphore("changelog"):
+        return await fetch_changelog_content(changelog_url, version, client)
+
+
+def _trim_npm(data: dict) -> dict:
+    """
+    The parts of a (full or abbreviated) packument fetch_npm_latest reads.
+    """
+    dist_tags = data.get("dist-tags") or {}
+    latest = dist_tags.get("latest")
+    trimmed = {"dist-tags": dist_tags}
+    for key in ("description", "repository"):
+        if key in data:
+            trimmed[key] = data[key]
+    times = data.get("time") or {}
+    if latest:
+        if latest in times:
+            trimmed["time"] = {latest: times[latest]}
+    else:
+        # Rare: no dist-tags.latest, so the fallback needs every version (and its time)
+        trimmed["versions"] = list(data.get("versions") or ())
+        if times:
+            trimmed["time"] = times
+    return trimmed
+
+
+def _trim_pypi(data: dict) -> dict:
+    """
+    The parts of a PyPI JSON API document fetch_pypi_latest reads.
+    """
+    info = data.get("info") or {}
+    latest = info.get("version")
+    trimmed = {"info": {k: info[k] for k in ("version", "summary", "project_urls", "project_url") if k in info}}
+    files = (data.get("releases") or {}).get(latest) if latest else None
+    if files:
+        trimmed["releases"] = {latest: [{"upload_time": files[0].get("upload_time")}]}
+    return trimmed
+
+
+def _trim_pypi_simple(data: dict) -> dict:
+    """
+    The release versions of a PEP 691/700 project page, minus fully yanked ones.
+    """
+    versions = data.get("versions") or []
+    yanked = _yanked_only_versions(data.get("files") or ())
+    if yanked:
+        from packaging.version import Version, InvalidVersion
+
+        def is_yanked(v: str) -> bool:
+            try:
+                return Version(v) in yanked
+            except InvalidVersion:
+                return False
+
+        versions = [v for v in versions if not is_yanked(v)]
+    return {"versions": versions}
+
+
+async def _get_registry_json(
+    client: httpx.AsyncClient,
+    registry: str,
+    package_name: str,
+    url: str,
+    trim: Callable[[dict], dict],
+    accept: Optional[str] = None,
+    cache_namespace: Optional[str] = None,
+) -> dict:
+    """
+    GETs a registry JSON document, revalidating against the on-disk cache.
+
+    A stored response younger than registry_cache.DISK_TTL is returned without any
+    request, so repeated tool calls and server restarts don't hit the registry again.
+
+    Neither registry offers a bulk "latest version" lookup (npm's bulk endpoint only
+    returns security advisories and PyPI's /simple/ root lists names without versions),
+    so requests stay per package and are multiplexed over the shared HTTP/2 client.
+
+    Only trim(document) is returned and stored: the few fields the caller reads,
+    not the full document (npm packuments run to megabytes). When an older response
+    is stored, its ETag / Last-Modified are sent as If-None-Match / If-Modified-Since;
+    a 304 reuses the stored payload and only refreshes its timestamp. Responses
+    requested with a non-default Accept type must pass their own cache_namespace so
+    they aren't mixed with full documents.
+
+    Each attempt holds one of the registry's concurrency slots. Transient statuses
+    (429/5xx) are retried with jittered exponential backoff, or after Retry-After
+    when the registry sends it; the slot is released while waiting.
+    """
+    cache_namespace = cache_namespace or registry
+    cached = await registry_cache.load_response(cache_namespace, package_name)
+    if cached and registry_cache.is_fresh(cached):
+        return cached["payload"]
+    headers = {"Accept": accept} if accept else {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    for attempt in range(_MAX_ATTEMPTS):
+        async with _registry_semaphore(registry):
+            r = await client.get(url, headers=headers)
+        if r.status_code not in _RETRY_STATUSES or attempt == _MAX_ATTEMPTS - 1:
+            break
+        await asyncio.sleep(_retry_delay(attempt, r))
+
+    if r.status_code == 304 and cached:
+        # Still current: restart its freshness window so the next calls skip the network
+        await registry_cache.touch_response(cache_namespace, package_name)
+        return cached["payload"]
+    r.raise_for_status()
+    # npm packuments for popular packages run to megabytes; orjson parses them several times faster
+    data = trim(orjson.loads(r.content))
+
+    await registry_cache.store_response(cache_namespace, package_name, {
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "payload": data,
+    })
+    return data
+
+
+async def fetch_npm_latest(package_name: str, client: Optional[httpx.AsyncClient] = None, include_metadata: bool = True) -> RegistryResult:
     """
     npm registry packument: https://registry.npmjs.org/<name>
     We'll read dist-tags.latest and extract contextual information.
+    Uses the shared pooled client unless another client is passed in.
+
+    With include_metadata=False only the abbreviated packument is downloaded and no
+    changelog is fetched; release_date and description are then left empty.
     """
+    client = client or _get_client()
+
     url = f"https://registry.npmjs.org/{package_name}"
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.get(url)
-        r.raise_for_status()
-        data = r.json()
+    if include_metadata:
+        data = await _get_registry_json(client, "npm", package_name, url, _trim_npm)
+    else:
+        try:
+            data = await _get_registry_json(
+                client, "npm", package_name, url, _trim_npm, accept=_NPM_ABBREVIATED, cache_namespace="npm-abbreviated"
+            )
+        except httpx.HTTPStatusError as e:
+            # Registry mirrors that don't know the abbreviated format answer 406
+            if e.response.status_code != 406:
+                raise
+            data = await _get_registry_json(client, "npm", package_name, url, _trim_npm)
 
-    dist_tags = data.get("dist-tags") or {}
+    dist_tags = data.get("dist-tags") or _EMPTY
     latest = dist_tags.get("latest")
     note = None
     
     if not latest:
         # fallback: no dist-tag - use semantic version sorting
-        version_strings = list((data.get("versions") or {}).keys())
+        version_strings = list(data.get("versions") or _EMPTY)
         if version_strings:
-            # Parse versions and filter out invalid ones
-            valid_versions = []
+            # Imported here: this fallback is rare and packaging is otherwise unused in this module
+            from packaging.version import Version, InvalidVersion
+
+            # Keep only the running maximum instead of materializing every Version
+            best = None
             for v in version_strings:
                 try:
-                    valid_versions.append(Version(v))
+                    candidate = Version(v)
                 except InvalidVersion:
                     # Skip invalid version strings
                     continue
+                if best is None or candidate > best:
+                    best = candidate
             
-            if valid_versions:
-                # Get the highest semantic version
-                latest = str(max(valid_versions))
-            else:
-                # All versions were invalid, fall back to string sort
-                latest = sorted(version_strings)[-1]
+            # Fall back to string sort when every version string was invalid
+            latest = str(best) if best is not None else max(version_strings)
         else:
             latest = "unknown"
         
@@ -57,24 +295,29 @@ async def fetch_npm_latest(package_name: str) -> RegistryResult:
     
     # Extract contextual information
     description = data.get("description")
-    homepage = data.get("homepage")
+    
+    # Get release date for the latest version
+    release_date = None
+    if latest and latest != "unknown":
+        release_date = (data.get("time") or _EMPTY).get(latest)
+    
+    if not include_metadata:
+        return RegistryResult(
+            latest=latest,
+            changelog_content=_METADATA_SKIPPED,
+            note=note,
+            release_date=release_date,
+            description=description
+        )
     
     # Get repository URL
     repository = data.get("repository")
     repository_url = None
     if repository:
         if isinstance(repository, dict):
-            repository_url = repository.get("url", "").replace("git+", "").replace(".git", "")
+            repository_url = _GIT_URL_NOISE_RE.sub("", repository.get("url", ""))
         elif isinstance(repository, str):
-            repository_url = repository.replace("git+", "").replace(".git", "")
-    
-    # Get release date for the latest version
-    release_date = None
-    if latest and latest != "unknown":
-        versions = data.get("versions") or {}
-        version_data = versions.get(latest) or {}
-        time_data = data.get("time") or {}
-        release_date = time_data.get(latest)
+            repository_url = _GIT_URL_NOISE_RE.sub("", repository)
     
     # Construct changelog URL (common patterns for npm packages)
     changelog_url = None
@@ -85,10 +328,10 @@ async def fetch_npm_latest(package_name: str) -> RegistryResult:
             changelog_url = f"{base_url}/releases"
     
     # Fetch changelog content
-    changelog_content = await fetch_changelog_content(changelog_url, str(latest))
+    changelog_content = await _fetch_changelog(changelog_url, latest, client)
 
     return RegistryResult(
-        latest=str(latest),
+        latest=latest,
         changelog_content=changelog_content,
         note=note,
         release_date=release_date,
@@ -96,26 +339,30 @@ async def fetch_npm_latest(package_name: str) -> RegistryResult:
     )
 
 
-async def fetch_pypi_latest(package_name: str) -> RegistryResult:
+async def fetch_pypi_latest(package_name: str, client: Optional[httpx.AsyncClient] = None, include_metadata: bool = True) -> RegistryResult:
     """
     PyPI JSON API: https://pypi.org/pypi/<project>/json
     We'll use info.version as the latest release string and extract contextual information.
+    Uses the shared pooled client unless another client is passed in.
+
+    With include_metadata=False this delegates to fetch_pypi_latest_fast.
     """
+    if not include_metadata:
+        return await fetch_pypi_latest_fast(package_name, client)
+
+    client = client or _get_client()
+
     url = f"https://pypi.org/pypi/{package_name}/json"
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.get(url)
-        r.raise_for_status()
-        data = r.json()
+    data = await _get_registry_json(client, "pypi", package_name, url, _trim_pypi)
 
-    info = data.get("info") or {}
+    info = data.get("info") or _EMPTY
     latest = info.get("version") or "unknown"
     
     # Extract contextual information
     description = info.get("summary")  # PyPI uses "summary" field
-    homepage = info.get("home_page") or info.get("package_url")
     
     # Get URLs (PyPI provides structured URLs)
-    project_urls = info.get("project_urls") or {}
+    project_urls = info.get("project_urls") or _EMPTY
     
     # Look for changelog in multiple common keys
     changelog_url = (
@@ -144,7 +391,7 @@ async def fetch_pypi_latest(package_name: str) -> RegistryResult:
     
     # Get release date from releases data
     release_date = None
-    releases = data.get("releases") or {}
+    releases = data.get("releases") or _EMPTY
     if latest and latest != "unknown" and latest in releases:
         release_info = releases[latest]
         if release_info and len(release_info) > 0:
@@ -152,11 +399,89 @@ async def fetch_pypi_latest(package_name: str) -> RegistryResult:
             release_date = release_info[0].get("upload_time")
     
     # Fetch changelog content
-    changelog_content = await fetch_changelog_content(changelog_url, str(latest))
+    changelog_content = await _fetch_changelog(changelog_url, latest, client)
     
     return RegistryResult(
-        latest=str(latest),
+        latest=latest,
         changelog_content=changelog_content,
         release_date=release_date,
         description=description
     )
+
+
+def _file_version(filename: str):
+    """
+    Version encoded in a wheel or sdist file name, or None if the name can't be parsed.
+    """
+    from packaging.utils import InvalidSdistFilename, InvalidWheelFilename, parse_sdist_filename, parse_wheel_filename
+    from packaging.version import InvalidVersion
+
+    try:
+        if filename.endswith(".whl"):
+            return parse_wheel_filename(filename)[1]
+        return parse_sdist_filename(filename)[1]
+    except (InvalidWheelFilename, InvalidSdistFilename, InvalidVersion):
+        return None
+
+
+def _yanked_only_versions(files: Sequence[dict]) -> Set:
+    """
+    Versions from a PEP 691 files list whose every file is yanked.
+
+    PEP 700's "versions" key still lists yanked releases, so they are recovered
+    from the wheel/sdist file names. Yanking is rare, so file names are only parsed
+    for yanked files and for live files that could share a yanked version; large
+    projects list thousands of files and this runs on the event loop.
+    """
+    yanked_files = [f.get("filename") or "" for f in files if f.get("yanked")]
+    if not yanked_files:
+        return set()
+
+    yanked = {v for v in map(_file_version, yanked_files) if v is not None}
+    # File names carry the normalized version right after the "-" that ends the project name
+    markers = tuple(f"-{v}" for v in yanked)
+    live = set()
+    for f in files:
+        filename = f.get("filename") or ""
+        if not f.get("yanked") and any(m in filename for m in markers):
+            version = _file_version(filename)
+            if version is not None:
+                live.add(version)
+    return yanked - live
+
+
+async def fetch_pypi_latest_fast(package_name: str, client: Optional[httpx.AsyncClient] = None) -> RegistryResult:
+    """
+    PyPI Simple API, JSON form (PEP 691/700): https://pypi.org/simple/<project>/
+    Much smaller than the JSON API, but only lists versions and files, so the result
+    carries the latest version alone (no changelog, description or release date).
+    Like info.version, the latest final release wins over newer pre-releases, and
+    versions whose files are all yanked (PEP 592) are skipped.
+    """
+    client = client or _get_client()
+
+    url = f"https://pypi.org/simple/{package_name}/"
+    data = await _get_registry_json(
+        client, "pypi", package_name, url, _trim_pypi_simple, accept=_PYPI_SIMPLE_JSON, cache_namespace="pypi-simple"
+    )
+
+    from packaging.version import Version, InvalidVersion
+
+    # Fully yanked versions were already dropped when the page was trimmed
+    best = None
+    best_final = None
+    for v in data.get("versions") or ():
+        try:
+            candidate = Version(v)
+        except InvalidVersion:
+            continue
+        if best is None or candidate > best:
+            best = candidate
+        if not candidate.is_prerelease and (best_final is None or candidate > best_final):
+            best_final = candidate
+
+    latest = best_final or best
+    return RegistryResult(
+        latest=str(latest) if latest is not None else "unknown",
+        changelog_content=_METADATA_SKIPPED,
+    )
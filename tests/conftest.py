@@ -0,0 +1,11 @@
+import pytest
+
+from utils import registry_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_registry_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_CACHE_DIR", str(tmp_path / "cache"))
+    registry_cache.clear()
+    yield
+    registry_cache.clear()
@@ -0,0 +1,84 @@
+import json
+import pytest
+from src.services import changelog_fetcher
+
+@pytest.mark.asyncio
+async def test_github_releases_revalidated_with_etag(monkeypatch):
+    sent_headers = []
+
+    async def fake_get(self, url, headers=None, **kwargs):
+        class R:
+            def __init__(self, status_code, payload, headers):
+                self.status_code = status_code
+                self.content = json.dumps(payload).encode()
+                self.headers = headers
+
+        sent_headers.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return R(304, None, {})
+        return R(200, [{"tag_name": "v1.0.0", "body": "Initial release"}], {"ETag": '"v1"'})
+
+    monkeypatch.setattr(changelog_fetcher, "_GITHUB_RELEASES_CACHE", {})
+    monkeypatch.setattr(changelog_fetcher.httpx.AsyncClient, "get", fake_get)
+
+    url = "https://github.com/acme/widget/releases"
+    first = await changelog_fetcher.fetch_changelog_content(url, "1.0.0")
+    second = await changelog_fetcher.fetch_changelog_content(url, "1.0.0")
+
+    assert first == second == "Release v1.0.0:\n\nInitial release"
+    assert sent_headers[1]["If-None-Match"] == '"v1"'
+
+@pytest.mark.asyncio
+async def test_changelog_page_probed_with_head(monkeypatch):
+    async def fake_head(self, url, **kwargs):
+        class R:
+            status_code = 200
+        return R()
+
+    async def fail_get(self, url, **kwargs):
+        raise AssertionError("changelog page body should not be downloaded")
+
+    monkeypatch.setattr(changelog_fetcher.httpx.AsyncClient, "head", fake_head)
+    monkeypatch.setattr(changelog_fetcher.httpx.AsyncClient, "get", fail_get)
+
+    url = "https://example.com/CHANGELOG.md"
+    content = await changelog_fetcher.fetch_changelog_content(url, "1.0.0")
+    assert content.startswith(f"Changelog available at: {url}")
+
+@pytest.mark.asyncio
+async def test_exact_tag_preferred_over_substring_match(monkeypatch):
+    async def fake_get(self, url, **kwargs):
+        class R:
+            status_code = 200
+            headers = {}
+            content = json.dumps([
+                {"tag_name": "v2.0.10", "name": None, "body": "Later patch"},
+                {"tag_name": "v2.0.1", "name": "2.0.1", "body": "Exact release"},
+            ]).encode()
+        return R()
+
+    monkeypatch.setattr(changelog_fetcher, "_GITHUB_RELEASES_CACHE", {})
+    monkeypatch.setattr(changelog_fetcher.httpx.AsyncClient, "get", fake_get)
+
+    content = await changelog_fetcher.fetch_changelog_content("https://github.com/acme/widget/releases", "2.0.1")
+    assert content == "Release v2.0.1:\n\nExact release"
+
+@pytest.mark.asyncio
+async def test_releases_cache_is_bounded(monkeypatch):
+    async def fake_get(self, url, **kwargs):
+        class R:
+            status_code = 200
+            headers = {"ETag": '"x"'}
+            content = json.dumps([{"tag_name": f"v1.0.{i}", "body": "notes"} for i in range(30)]).encode()
+        return R()
+
+    cache = {}
+    monkeypatch.setattr(changelog_fetcher, "_GITHUB_RELEASES_CACHE", cache)
+    monkeypatch.setattr(changelog_fetcher, "_GITHUB_RELEASES_MAXSIZE", 2)
+    monkeypatch.setattr(changelog_fetcher.httpx.AsyncClient, "get", fake_get)
+
+    for repo in ("a", "b", "c"):
+        await changelog_fetcher.fetch_changelog_content(f"https://github.com/acme/{repo}/releases", "1.0.0")
+
+    assert list(cache) == ["https://api.github.com/repos/acme/b/releases", "https://api.github.com/repos/acme/c/releases"]
+    assert all(len(releases) == 10 for _, releases in cache.values())
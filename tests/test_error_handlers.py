@@ -0,0 +1,16 @@
+import httpx
+from src.services.error_handlers import handle_registry_error
+
+def test_http_status_error():
+    request = httpx.Request("GET", "https://pypi.org/pypi/nope/json")
+    error = httpx.HTTPStatusError("not found", request=request, response=httpx.Response(404, request=request))
+    res = handle_registry_error("nope", "nope==1.0", error, "PyPI")
+    assert res.current == "nope==1.0"
+    assert res.status == "unknown"
+    assert res.note == "HTTP 404: package not found or unavailable"
+    assert "PyPI registry (HTTP 404)" in res.changelog_content
+
+def test_unexpected_error():
+    res = handle_registry_error("react", "^18.0.0", ValueError("boom"), "npm")
+    assert res.latest == "unknown"
+    assert res.note == "Unexpected error: ValueError"
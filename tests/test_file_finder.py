@@ -1,4 +1,4 @@
-from utils.file_finder import find_dependency_files
+from utils.file_finder import find_dependency_files, find_dependency_files_recursive
 
 def test_find_package_json(tmp_path):
     (tmp_path / "package.json").write_text("{}")
@@ -16,3 +16,23 @@ def test_find_nothing(tmp_path):
     files = find_dependency_files(str(tmp_path))
     assert files["package_json"] is None
     assert files["requirements_txt"] is None
+
+def test_find_only_wanted(tmp_path):
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "requirements.txt").write_text("")
+    files = find_dependency_files(str(tmp_path), {"requirements_txt"})
+    assert files["requirements_txt"] is not None
+    assert files["package_json"] is None
+
+def test_find_recursive_skips_pruned_dirs(tmp_path):
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "packages" / "web").mkdir(parents=True)
+    (tmp_path / "packages" / "web" / "package.json").write_text("{}")
+    (tmp_path / "node_modules" / "left-pad").mkdir(parents=True)
+    (tmp_path / "node_modules" / "left-pad" / "package.json").write_text("{}")
+    files = find_dependency_files_recursive(str(tmp_path))
+    assert sorted(files["package_json"]) == sorted([
+        tmp_path.resolve() / "package.json",
+        tmp_path.resolve() / "packages" / "web" / "package.json",
+    ])
+    assert files["requirements_txt"] == []
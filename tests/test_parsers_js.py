@@ -1,5 +1,5 @@
 import json
-from utils.parsers import parse_package_json
+from utils.parsers import iter_package_json, parse_package_json
 
 def test_parse_dependencies(tmp_path):
     data = {"dependencies": {"react": "17.0.2"}}
@@ -14,3 +14,29 @@ def test_parse_dev_dependencies(tmp_path):
     path.write_text(json.dumps(data))
     deps = parse_package_json(path)
     assert deps == {"eslint": "^8.0.0"}
+
+def test_reparses_only_when_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "package.json"
+    path.write_text(json.dumps({"dependencies": {"react": "17.0.2"}}))
+    first = parse_package_json(path)
+
+    reads = []
+    original = type(path).read_bytes
+    monkeypatch.setattr(type(path), "read_bytes", lambda self: reads.append(self) or original(self))
+    assert parse_package_json(path) == first
+    assert reads == []
+
+    path.write_text(json.dumps({"dependencies": {"react": "18.2.0", "vue": "3.0.0"}}))
+    assert parse_package_json(path) == {"react": "18.2.0", "vue": "3.0.0"}
+
+def test_iter_package_json_yields_pairs_in_order(tmp_path):
+    data = {"dependencies": {"react": " 17.0.2 "}, "devDependencies": {"eslint": "^8.0.0", "bad": 1}}
+    path = tmp_path / "package.json"
+    path.write_text(json.dumps(data))
+    assert list(iter_package_json(path)) == [("react", "17.0.2"), ("eslint", "^8.0.0")]
+
+def test_first_section_wins_for_duplicates(tmp_path):
+    data = {"dependencies": {"react": "^18.0.0"}, "peerDependencies": {"react": ">=16"}}
+    path = tmp_path / "package.json"
+    path.write_text(json.dumps(data))
+    assert parse_package_json(path) == {"react": "^18.0.0"}
@@ -1,4 +1,6 @@
-from utils.parsers import parse_requirements_txt
+import pytest
+
+from utils.parsers import parse_all, parse_requirements_txt
 
 def test_exact_version(tmp_path):
     p = tmp_path / "requirements.txt"
@@ -23,3 +25,29 @@ def test_ignore_comments(tmp_path):
     p.write_text("# comment\n\nflask")
     deps = parse_requirements_txt(p)
     assert deps == [("flask", "")]
+
+def test_splits_at_first_operator(tmp_path):
+    p = tmp_path / "requirements.txt"
+    p.write_text("django<5.0,>=4.2")
+    deps = parse_requirements_txt(p)
+    assert deps == [("django", "<5.0,>=4.2")]
+
+def test_vcs_and_direct_url(tmp_path):
+    p = tmp_path / "requirements.txt"
+    p.write_text("mylib @ git+https://github.com/org/mylib.git\nhttpx[http2]>=0.28")
+    deps = parse_requirements_txt(p)
+    assert deps == [
+        ("mylib", "mylib @ git+https://github.com/org/mylib.git"),
+        ("httpx[http2]", ">=0.28"),
+    ]
+
+@pytest.mark.asyncio
+async def test_parse_all(tmp_path):
+    (tmp_path / "requirements.txt").write_text("flask==3.0.0")
+    (tmp_path / "package.json").write_text('{"dependencies": {"react": "18.2.0"}}')
+    parsed = await parse_all({
+        "package_json": tmp_path / "package.json",
+        "requirements_txt": tmp_path / "requirements.txt",
+    })
+    assert parsed == {"package_json": {"react": "18.2.0"}, "requirements_txt": [("flask", "==3.0.0")]}
+    assert await parse_all({"package_json": None, "requirements_txt": None}) == {}
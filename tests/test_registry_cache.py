@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from utils import registry_cache
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_fetch():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return "18.2.0"
+
+    assert await registry_cache.get_or_fetch(("npm", "react"), fetch) == "18.2.0"
+    assert await registry_cache.get_or_fetch(("npm", "react"), fetch) == "18.2.0"
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_failures_use_negative_ttl(monkeypatch):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        raise RuntimeError("registry down")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await registry_cache.get_or_fetch(("pypi", "flask"), fetch)
+    assert len(calls) == 1
+
+    # Once the negative TTL has elapsed the fetch is retried
+    monkeypatch.setattr(registry_cache, "NEGATIVE_TTL", 0)
+    with pytest.raises(RuntimeError):
+        await registry_cache.get_or_fetch(("pypi", "flask"), fetch)
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_cached_failure_traceback_does_not_grow():
+    async def fetch():
+        raise RuntimeError("registry down")
+
+    depths = []
+    for _ in range(4):
+        with pytest.raises(RuntimeError) as excinfo:
+            await registry_cache.get_or_fetch(("pypi", "flask"), fetch)
+        depths.append(len(excinfo.traceback))
+    assert depths[1] == depths[2] == depths[3]
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_dropped(monkeypatch):
+    async def fail():
+        raise RuntimeError("registry down")
+
+    async def fetch():
+        return "1.0.0"
+
+    with pytest.raises(RuntimeError):
+        await registry_cache.get_or_fetch(("pypi", "flask"), fail)
+    monkeypatch.setattr(registry_cache, "NEGATIVE_TTL", 0)
+    await registry_cache.get_or_fetch(("pypi", "requests"), fetch)
+
+    assert list(registry_cache._CACHE) == [("pypi", "requests")]
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "2.31.0"
+
+    results = await asyncio.gather(
+        *(registry_cache.get_or_fetch(("pypi", "requests"), fetch) for _ in range(5))
+    )
+    assert results == ["2.31.0"] * 5
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_oldest_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(registry_cache, "MAXSIZE", 2)
+
+    async def fetch():
+        return "1.0.0"
+
+    for name in ("a", "b", "c"):
+        await registry_cache.get_or_fetch(("npm", name), fetch)
+    assert list(registry_cache._CACHE) == [("npm", "b"), ("npm", "c")]
+
+@pytest.mark.asyncio
+async def test_disk_cache_sweeps_files_from_other_versions(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(registry_cache, "_SWEPT", set())
+    (tmp_path / "npm").mkdir()
+    old = tmp_path / "npm" / "react-0.0.1.json"
+    old.write_bytes(b"{}")
+
+    await registry_cache.store_response("npm", "react", {"etag": None, "last_modified": None, "payload": {"a": 1}})
+    entry = await registry_cache.load_response("npm", "react")
+
+    assert entry["payload"] == {"a": 1}
+    assert not old.exists()
@@ -1,3 +1,5 @@
+import asyncio
+import json
 import pytest
 from src.services import registry_clients
 
@@ -8,7 +10,11 @@ async def test_fetch_npm_latest(monkeypatch):
             def __init__(self, url):
                 self.url = url
                 self.status_code = 200
+                self.headers = {}
             def raise_for_status(self): pass
+            @property
+            def content(self):
+                return json.dumps(self.json()).encode()
             def json(self):
                 # Registry API response
                 if "registry.npmjs.org" in self.url:
@@ -56,7 +62,11 @@ async def test_fetch_pypi_latest(monkeypatch):
             def __init__(self, url):
                 self.url = url
                 self.status_code = 200
+                self.headers = {}
             def raise_for_status(self): pass
+            @property
+            def content(self):
+                return json.dumps(self.json()).encode()
             def json(self):
                 # PyPI API response
                 if "pypi.org" in self.url:
@@ -80,7 +90,13 @@ async def test_fetch_pypi_latest(monkeypatch):
                 return {}
         return R(url)
 
+    async def fake_head(self, url, **kwargs):
+        class R:
+            status_code = 200
+        return R()
+
     monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "head", fake_head)
     res = await registry_clients.fetch_pypi_latest("requests")
     assert res.latest == "2.31.0"
     assert res.description == "Python HTTP for Humans."
@@ -90,3 +106,287 @@ async def test_fetch_pypi_latest(monkeypatch):
     assert len(res.changelog_content) > 0
     # For this test, since it's a non-GitHub releases URL, it should have a fallback message
     assert "Changelog" in res.changelog_content
+    assert "HISTORY.md" in res.changelog_content
+
+@pytest.mark.asyncio
+async def test_fetch_pypi_latest_revalidates_with_etag(monkeypatch):
+    sent_headers = []
+
+    async def fake_get(self, url, headers=None, **kwargs):
+        class R:
+            def __init__(self, status_code, payload, headers):
+                self.status_code = status_code
+                self._payload = payload
+                self.headers = headers
+            def raise_for_status(self): pass
+            @property
+            def content(self):
+                return json.dumps(self.json()).encode()
+            def json(self):
+                return self._payload
+
+        if "pypi.org" not in url:
+            return R(200, {}, {})
+        sent_headers.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == '"abc"':
+            return R(304, None, {})
+        return R(200, {"info": {"version": "2.31.0"}}, {"ETag": '"abc"'})
+
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+    # Treat every stored response as stale so the second call revalidates
+    monkeypatch.setattr(registry_clients.registry_cache, "DISK_TTL", 0)
+    first = await registry_clients.fetch_pypi_latest("requests")
+    second = await registry_clients.fetch_pypi_latest("requests")
+
+    assert first.latest == second.latest == "2.31.0"
+    assert "If-None-Match" not in sent_headers[0]
+    assert sent_headers[1]["If-None-Match"] == '"abc"'
+
+@pytest.mark.asyncio
+async def test_disk_cache_stores_trimmed_payload(monkeypatch):
+    writes = []
+
+    async def fake_get(self, url, headers=None, **kwargs):
+        class R:
+            def __init__(self, status_code, payload, headers):
+                self.status_code = status_code
+                self.content = json.dumps(payload).encode()
+                self.headers = headers
+            def raise_for_status(self): pass
+
+        if (headers or {}).get("If-None-Match") == '"abc"':
+            return R(304, None, {})
+        return R(200, {
+            "dist-tags": {"latest": "2.0.0"},
+            "versions": {"1.0.0": {"dist": {}}, "2.0.0": {"dist": {}}},
+            "time": {"1.0.0": "2020-01-01", "2.0.0": "2021-01-01"},
+            "description": "A widget",
+            "readme": "x" * 10000,
+        }, {"ETag": '"abc"'})
+
+    real_write = registry_clients.registry_cache._write_response
+    monkeypatch.setattr(registry_clients.registry_cache, "_write_response", lambda path, entry: writes.append(entry) or real_write(path, entry))
+    monkeypatch.setattr(registry_clients.registry_cache, "DISK_TTL", 0)
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+
+    first = await registry_clients.fetch_npm_latest("widget", include_metadata=False)
+    second = await registry_clients.fetch_npm_latest("widget", include_metadata=False)
+
+    assert (first.latest, first.release_date, first.description) == ("2.0.0", "2021-01-01", "A widget")
+    assert second == first
+    # One write for the 200; the 304 only refreshes the file's timestamp
+    assert [entry["payload"] for entry in writes] == [{
+        "dist-tags": {"latest": "2.0.0"},
+        "description": "A widget",
+        "time": {"2.0.0": "2021-01-01"},
+    }]
+
+@pytest.mark.asyncio
+async def test_fresh_disk_cache_skips_registry(monkeypatch):
+    calls = []
+
+    async def fake_get(self, url, headers=None, **kwargs):
+        calls.append(url)
+        class R:
+            status_code = 200
+            headers = {}
+            content = json.dumps({"versions": ["1.0.0", "1.1.0"]}).encode()
+            def raise_for_status(self): pass
+        return R()
+
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+    first = await registry_clients.fetch_pypi_latest_fast("requests")
+    second = await registry_clients.fetch_pypi_latest_fast("requests")
+
+    assert first.latest == second.latest == "1.1.0"
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_registry_requests_are_bounded(monkeypatch):
+    active = 0
+    peak = 0
+
+    async def fake_get(self, url, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+        class R:
+            status_code = 200
+            headers = {}
+            content = json.dumps({"info": {"version": "1.0.0"}}).encode()
+            def raise_for_status(self): pass
+        return R()
+
+    monkeypatch.setenv("MCP_MAX_CONCURRENCY", "2")
+    monkeypatch.setattr(registry_clients, "_semaphores", {})
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+
+    results = await asyncio.gather(
+        *(registry_clients.fetch_pypi_latest(name) for name in "abcd")
+    )
+
+    assert [r.latest for r in results] == ["1.0.0"] * 4
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_changelog_requests_are_bounded(monkeypatch):
+    active = 0
+    peak = 0
+
+    async def fake_get(self, url, **kwargs):
+        nonlocal active, peak
+        class R:
+            status_code = 200
+            headers = {}
+            def raise_for_status(self): pass
+
+        r = R()
+        if "api.github.com" in url:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            r.content = json.dumps([{"tag_name": "v1.0.0", "body": "notes"}]).encode()
+        else:
+            r.content = json.dumps({
+                "dist-tags": {"latest": "1.0.0"},
+                "repository": {"url": f"git+https://github.com/acme/{url.rsplit('/', 1)[-1]}.git"},
+            }).encode()
+        return r
+
+    monkeypatch.setenv("MCP_MAX_CONCURRENCY", "2")
+    monkeypatch.setattr(registry_clients, "_semaphores", {})
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+
+    results = await asyncio.gather(
+        *(registry_clients.fetch_npm_latest(name) for name in "abcdef")
+    )
+
+    assert [r.changelog_content for r in results] == ["Release v1.0.0:\n\nnotes"] * 6
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_fetch_npm_latest_without_metadata_uses_abbreviated_packument(monkeypatch):
+    accepts = []
+
+    async def fake_get(self, url, headers=None, **kwargs):
+        class R:
+            status_code = 200
+            headers = {}
+            content = json.dumps({"dist-tags": {"latest": "4.17.21"}}).encode()
+            def raise_for_status(self): pass
+
+        accepts.append((headers or {}).get("Accept"))
+        return R()
+
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+    res = await registry_clients.fetch_npm_latest("lodash", include_metadata=False)
+
+    assert res.latest == "4.17.21"
+    assert res.release_date is None
+    assert accepts == ["application/vnd.npm.install-v1+json"]
+
+@pytest.mark.asyncio
+async def test_fetch_npm_latest_falls_back_to_highest_version(monkeypatch):
+    async def fake_get(self, url, headers=None, **kwargs):
+        class R:
+            status_code = 200
+            headers = {}
+            content = json.dumps({"versions": {"1.2.0": {}, "1.10.0": {}, "not-a-version": {}, "1.9.3": {}}}).encode()
+            def raise_for_status(self): pass
+        return R()
+
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+    res = await registry_clients.fetch_npm_latest("left-pad")
+
+    assert res.latest == "1.10.0"
+    assert res.note == "missing dist-tags.latest; used fallback"
+
+@pytest.mark.asyncio
+async def test_fetch_pypi_latest_without_metadata_uses_simple_api(monkeypatch):
+    requests = []
+
+    async def fake_get(self, url, headers=None, **kwargs):
+        class R:
+            status_code = 200
+            headers = {}
+            content = json.dumps({"versions": ["2.30.0", "2.31.0", "2.32.0rc1"]}).encode()
+            def raise_for_status(self): pass
+
+        requests.append((url, (headers or {}).get("Accept")))
+        return R()
+
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+    res = await registry_clients.fetch_pypi_latest("requests", include_metadata=False)
+
+    assert res.latest == "2.31.0"
+    assert requests == [("https://pypi.org/simple/requests/", "application/vnd.pypi.simple.v1+json")]
+
+@pytest.mark.asyncio
+async def test_simple_api_skips_yanked_versions(monkeypatch):
+    async def fake_get(self, url, headers=None, **kwargs):
+        class R:
+            status_code = 200
+            headers = {}
+            content = json.dumps({
+                "versions": ["2.31.0", "2.32.0"],
+                "files": [
+                    {"filename": "requests-2.31.0.tar.gz", "yanked": False},
+                    {"filename": "requests-2.31.0-py3-none-any.whl", "yanked": False},
+                    {"filename": "requests-2.32.0.tar.gz", "yanked": "Broken release"},
+                    {"filename": "requests-2.32.0-py3-none-any.whl", "yanked": True},
+                ],
+            }).encode()
+            def raise_for_status(self): pass
+        return R()
+
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+    res = await registry_clients.fetch_pypi_latest_fast("requests")
+
+    assert res.latest == "2.31.0"
+
+def test_yanked_scan_parses_only_candidate_files(monkeypatch):
+    files = [{"filename": f"numpy-1.{i}.0-cp311-cp311-manylinux_x86_64.whl", "yanked": False} for i in range(500)]
+    parsed = []
+    real_file_version = registry_clients._file_version
+    monkeypatch.setattr(registry_clients, "_file_version", lambda name: parsed.append(name) or real_file_version(name))
+
+    assert registry_clients._yanked_only_versions(files) == set()
+    assert parsed == []
+
+    files += [
+        {"filename": "numpy-1.499.0.tar.gz", "yanked": True},
+        {"filename": "numpy-2.0.0.tar.gz", "yanked": True},
+    ]
+    assert [str(v) for v in registry_clients._yanked_only_versions(files)] == ["2.0.0"]
+    assert sorted(parsed) == sorted([
+        "numpy-1.499.0.tar.gz", "numpy-2.0.0.tar.gz", "numpy-1.499.0-cp311-cp311-manylinux_x86_64.whl",
+    ])
+
+@pytest.mark.asyncio
+async def test_registry_retries_transient_errors(monkeypatch):
+    statuses = [503, 429, 200]
+    delays = []
+
+    async def fake_get(self, url, **kwargs):
+        class R:
+            status_code = statuses.pop(0)
+            headers = {"Retry-After": "0"} if status_code == 429 else {}
+            content = json.dumps({"info": {"version": "1.0.0"}}).encode()
+            def raise_for_status(self): pass
+        return R()
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(registry_clients.httpx.AsyncClient, "get", fake_get)
+    monkeypatch.setattr(registry_clients.asyncio, "sleep", fake_sleep)
+    res = await registry_clients.fetch_pypi_latest("flask")
+
+    assert res.latest == "1.0.0"
+    assert len(delays) == 2
+    assert 1 <= delays[0] < 1.3  # backoff for the first retry
+    assert delays[1] == 0  # Retry-After honoured
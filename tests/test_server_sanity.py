@@ -1,3 +1,4 @@
+import asyncio
 import json
 import pytest
 from src.server import dependency_health_check
@@ -8,7 +9,7 @@ async def test_server_sanity_js(tmp_path, monkeypatch):
         json.dumps({"dependencies": {"react": "17.0.2"}})
     )
 
-    async def fake_fetch(name):
+    async def fake_fetch(name, client=None, include_metadata=True):
         class R:
             latest = "18.2.0"
             note = None
@@ -27,3 +28,120 @@ async def test_server_sanity_js(tmp_path, monkeypatch):
     assert len(deps) == 1
     assert deps[0]["name"] == "react"
     assert "status" in deps[0]
+
+@pytest.mark.asyncio
+async def test_server_checks_dependencies_concurrently(tmp_path, monkeypatch):
+    (tmp_path / "requirements.txt").write_text("requests==2.31.0\nflask==3.0.0\nnumpy==1.26.0")
+
+    active = 0
+    peak = 0
+
+    async def fake_fetch(name, client=None, include_metadata=True):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+        class R:
+            latest = "9.9.9"
+            note = None
+            release_date = None
+            changelog_content = "notes"
+            description = None
+        return R()
+
+    monkeypatch.setattr(
+        "src.server.fetch_pypi_latest", fake_fetch
+    )
+
+    result = await dependency_health_check({
+        "project_path": str(tmp_path),
+        "ecosystem": "python"
+    })
+
+    deps = result["dependencies"]
+    assert [d["name"] for d in deps] == ["requests", "flask", "numpy"]
+    assert all(d["status"] == "outdated" for d in deps)
+    assert peak == 3
+
+@pytest.mark.asyncio
+async def test_server_coalesces_duplicate_packages(tmp_path, monkeypatch):
+    (tmp_path / "requirements.txt").write_text("requests==2.31.0\nrequests>=2.0")
+
+    calls = []
+
+    async def fake_fetch(name, client=None, include_metadata=True):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+
+        class R:
+            latest = "2.31.0"
+            note = None
+            release_date = None
+            changelog_content = "notes"
+            description = None
+        return R()
+
+    monkeypatch.setattr("src.server.fetch_pypi_latest", fake_fetch)
+
+    result = await dependency_health_check({
+        "project_path": str(tmp_path),
+        "ecosystem": "python"
+    })
+
+    assert len(result["dependencies"]) == 2
+    assert calls == ["requests"]
+
+@pytest.mark.asyncio
+async def test_server_reports_missing_manifest(tmp_path):
+    result = await dependency_health_check({
+        "project_path": str(tmp_path),
+        "ecosystem": "auto"
+    })
+
+    deps = result["dependencies"]
+    assert len(deps) == 1
+    assert deps[0]["status"] == "unknown"
+    assert "unsupported or missing" in deps[0]["note"]
+
+@pytest.mark.asyncio
+async def test_failed_comparison_reported_per_dependency(tmp_path, monkeypatch):
+    (tmp_path / "package.json").write_text(
+        json.dumps({"dependencies": {"react": "17.0.2", "vue": "3.0.0", "lodash": "4.17.21"}})
+    )
+
+    async def fake_fetch(name, client=None, include_metadata=True):
+        class R:
+            latest = {"react": "18.2.0", "vue": "not a version", "lodash": "4.17.21"}[name]
+            note = None
+            changelog_content = "notes"
+            release_date = None
+            description = None
+        return R()
+
+    monkeypatch.setattr("src.server.fetch_npm_latest", fake_fetch)
+
+    result = await dependency_health_check({"project_path": str(tmp_path), "ecosystem": "javascript"})
+
+    deps = result["dependencies"]
+    assert [d["name"] for d in deps] == ["react", "vue", "lodash"]
+    assert [d["status"] for d in deps] == ["outdated", "unknown", "up-to-date"]
+    assert deps[1]["note"] == "Unexpected error: InvalidVersion"
+
+@pytest.mark.asyncio
+async def test_shared_client_outlives_overlapping_sessions(monkeypatch):
+    from src import server
+
+    closed = []
+
+    async def fake_aclose():
+        closed.append(server._active_sessions)
+
+    monkeypatch.setattr(server, "aclose_client", fake_aclose)
+
+    async with server.lifespan(server.mcp):
+        async with server.lifespan(server.mcp):
+            pass
+        assert closed == []
+    assert closed == [0]
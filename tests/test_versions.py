@@ -1,4 +1,4 @@
-from utils.versions import is_up_to_date, is_prerelease
+from utils.versions import _is_up_to_date_cached, convert_npm_range_to_specifier, is_up_to_date, is_up_to_date_batch, is_prerelease
 
 def test_outdated():
     ok, _ = is_up_to_date("17.0.2", "18.2.0")
@@ -36,3 +36,38 @@ def test_python_range():
 
 def test_prerelease_detected():
     assert is_prerelease("1.3.0-beta.1") is True
+
+def test_is_up_to_date_reuses_cached_result():
+    first = is_up_to_date(" ^3.1.0 ", "3.4.0")
+    hits = _is_up_to_date_cached.cache_info().hits
+    assert is_up_to_date("^3.1.0", "3.4.0") == first
+    assert _is_up_to_date_cached.cache_info().hits == hits + 1
+
+def test_convert_npm_ranges():
+    assert convert_npm_range_to_specifier("^0.2.3") == ">=0.2.3,<1.0.0"
+    assert convert_npm_range_to_specifier("~1.2") == ">=1.2,<1.3.0"
+    assert convert_npm_range_to_specifier("~4") == ">=4,<5.0.0"
+    assert convert_npm_range_to_specifier("^latest") is None
+
+def test_empty_spec_is_unknown():
+    ok, note = is_up_to_date("  ", "1.0.0")
+    assert ok is False
+    assert "could not parse" in note
+
+def test_prerelease_spellings():
+    assert is_prerelease("2.0.0rc1") is True
+    assert is_prerelease("2.0.0.dev3") is True
+    assert is_prerelease("2.0.0-preview") is True
+    assert is_prerelease("2.0.0") is False
+    assert is_prerelease("2.0.0.post1") is False
+
+def test_batch_keeps_order_and_errors():
+    results = is_up_to_date_batch([("^18.0.0", "18.2.0"), ("1.0.0", "not-a-version"), ("17.0.2", "18.2.0")])
+    assert results[0] == is_up_to_date("^18.0.0", "18.2.0")
+    assert isinstance(results[1], Exception)
+    assert results[2][0] is False
+
+def test_unparseable_latest_does_not_blame_spec():
+    assert is_up_to_date(">=1.0", "unknown") == (False, None)
+    assert is_up_to_date("^1.2.3", "unknown") == (False, "npm range detected; checked if latest satisfies range")
+    assert is_up_to_date("^1.2.3", "1.0.0-alpha.beta") == (False, "npm range detected; checked if latest satisfies range")
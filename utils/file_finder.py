@@ -1,21 +1,58 @@
 from __future__ import annotations
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
 
+# Result key -> manifest file name
+MANIFEST_FILES = {
+    "package_json": "package.json",
+    "requirements_txt": "requirements.txt",
+}
 
-def find_dependency_files(project_path: str) -> dict[str, Optional[Path]]:
+# Dependency, VCS and build output directories that never hold a project's own manifests
+PRUNED_DIRS = frozenset({"node_modules", ".git", ".venv", "venv", "__pycache__", "dist", "build"})
+
+
+def find_dependency_files(project_path: str, want: Optional[Iterable[str]] = None) -> dict[str, Optional[Path]]:
     """
     Locates dependency manifest files in the specified project directory.
     
     Returns a dictionary with keys 'package_json' and 'requirements_txt', containing
-    Path objects if the files exist, or None if they don't.
+    Path objects if the files exist, or None if they don't. When want is given, only
+    those keys are looked up; the others are reported as None.
     """
     root = Path(project_path).resolve()
+    wanted = MANIFEST_FILES.keys() if want is None else set(want)
+    filenames = {MANIFEST_FILES[key] for key in wanted}
 
-    package_json = root / "package.json"
-    requirements_txt = root / "requirements.txt"
+    # One directory read instead of a stat() per manifest
+    present = set()
+    try:
+        with os.scandir(root) as it:
+            present = {e.name for e in it if e.name in filenames and e.is_file()}
+    except OSError:
+        pass
 
     return {
-        "package_json": package_json if package_json.exists() else None,
-        "requirements_txt": requirements_txt if requirements_txt.exists() else None,
+        key: root / filename if filename in present else None
+        for key, filename in MANIFEST_FILES.items()
     }
+
+
+def find_dependency_files_recursive(project_path: str) -> dict[str, List[Path]]:
+    """
+    Locates dependency manifest files anywhere under the project directory (e.g. in monorepos).
+
+    Returns a dictionary with keys 'package_json' and 'requirements_txt', each mapping to the
+    list of matching Paths in walk order. Directories in PRUNED_DIRS are never descended into.
+    """
+    root = Path(project_path).resolve()
+    found: dict[str, List[Path]] = {key: [] for key in MANIFEST_FILES}
+
+    for dirpath, dirs, files in os.walk(root):
+        # Prune in place so os.walk skips these subtrees entirely
+        dirs[:] = [d for d in dirs if d not in PRUNED_DIRS]
+        for key, filename in MANIFEST_FILES.items():
+            if filename in files:
+                found[key].append(Path(dirpath) / filename)
+    return found
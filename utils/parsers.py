@@ -1,9 +1,77 @@
 from __future__ import annotations
-import json
+import asyncio
+import copy
+import functools
+import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, TypeVar
 
+import orjson
 
+# Version operators; two-character ones are listed first so ">=" isn't read as ">"
+_REQ_SEP = re.compile(r"==|>=|<=|~=|!=|>|<")
+
+# package.json dependency sections, in the order they are read
+_PACKAGE_JSON_SECTIONS = ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies")
+
+MAX_CACHED_MANIFESTS = 256  # oldest parsed manifests are dropped beyond this many files
+
+T = TypeVar("T")
+
+
+def _memoize_by_file(parse: Callable[[Path], T]) -> Callable[[Path], T]:
+    """
+    Caches a manifest parser's result per file, keyed on its (mtime_ns, size, inode).
+
+    Re-checking an unchanged manifest then costs one stat() instead of a read and parse;
+    any rewrite of the file changes the signature and forces a fresh parse. Callers get
+    a shallow copy so they can't mutate the cached value.
+    """
+    cache: Dict[str, Tuple[Tuple[int, int, int], Any]] = {}
+
+    @functools.wraps(parse)
+    def wrapper(path: Path) -> T:
+        st = path.stat()
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        key = str(path)
+        entry = cache.get(key)
+        if entry is None or entry[0] != signature:
+            entry = (signature, parse(path))
+            cache.pop(key, None)
+            cache[key] = entry
+            while len(cache) > MAX_CACHED_MANIFESTS:
+                del cache[next(iter(cache))]
+        return copy.copy(entry[1])
+
+    return wrapper
+
+
+def iter_package_json(path: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Yields (name, version specifier) pairs from every dependency section of a package.json,
+    in file order, without building an intermediate dict. Each name is yielded once.
+    """
+    # orjson parses the raw bytes directly (validating UTF-8 itself), skipping the str decode
+    data = orjson.loads(path.read_bytes())
+
+    # A name listed in several sections keeps its first entry: "dependencies" takes
+    # precedence, as in npm's own resolution, and later duplicates skip the strip()
+    seen = set()
+    for section in _PACKAGE_JSON_SECTIONS:
+        block = data.get(section)
+        if isinstance(block, dict):
+            for name, ver in block.items():
+                if name in seen:
+                    continue
+                if isinstance(name, str) and isinstance(ver, str):
+                    seen.add(name)
+                    # Specs like "^18.0.0" repeat across manifests; interned copies share one
+                    # object, so the version-check caches match them by identity
+                    yield name, sys.intern(ver.strip())
+
+
+@_memoize_by_file
 def parse_package_json(path: Path) -> Dict[str, str]:
     """
     Parses a package.json file and extracts all dependencies from all dependency sections.
@@ -11,18 +79,10 @@ def parse_package_json(path: Path) -> Dict[str, str]:
     Returns a dictionary mapping package names to their version specifiers (e.g., "^1.2.3").
     Includes dependencies, devDependencies, peerDependencies, and optionalDependencies.
     """
-    data = json.loads(path.read_text(encoding="utf-8"))
-
-    deps: Dict[str, str] = {}
-    for section in ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies"):
-        block = data.get(section) or {}
-        if isinstance(block, dict):
-            for name, ver in block.items():
-                if isinstance(name, str) and isinstance(ver, str):
-                    deps[name] = ver.strip()
-    return deps
+    return dict(iter_package_json(path))
 
 
+@_memoize_by_file
 def parse_requirements_txt(path: Path) -> List[Tuple[str, str]]:
     """
     Parses a requirements.txt file and extracts package names with their version specifiers.
@@ -32,32 +92,50 @@ def parse_requirements_txt(path: Path) -> List[Tuple[str, str]]:
     nested requirement files, and handles VCS/URL dependencies.
     """
     out: List[Tuple[str, str]] = []
-    for raw in path.read_text(encoding="utf-8").splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
-            continue
-        if line.startswith("-r") or line.startswith("--requirement"):
-            # keep it simple for now: skip nested files
-            continue
-        if line.startswith("-e") or line.startswith("--editable"):
-            continue
-        if "@" in line and "://" in line:
-            # VCS/URL dependency
-            name = line.split("@", 1)[0].strip()
-            out.append((name or line, line))
-            continue
-
-        # split like: package==1.2.3 / package>=1.0 / package
-        name = ""
-        spec = ""
-        for sep in ["==", ">=", "<=", "~=", "!=", ">", "<"]:
-            if sep in line:
-                left, right = line.split(sep, 1)
-                name = left.strip()
-                spec = sep + right.strip()
-                break
-        if not name:
-            name = line.strip()
-            spec = ""
-        out.append((name, spec))
+    # Iterate the file handle so only one line is held at a time
+    with path.open("r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            # nested files (-r/--requirement) and editable installs (-e/--editable) are skipped;
+            # a plain requirement never starts with "-", so it pays a single character test
+            if line[0] == "-" and line.startswith(("-r", "--requirement", "-e", "--editable")):
+                continue
+            # "://" is the rarer substring on ordinary lines, so test it first and only then look for "@"
+            if "://" in line and "@" in line:
+                # VCS/URL dependency
+                name = line.split("@", 1)[0].strip()
+                out.append((name or line, line))
+                continue
+
+            # split at the first operator: package==1.2.3 / package>=1.0 / package
+            m = _REQ_SEP.search(line)
+            if m and m.start():
+                name = line[:m.start()].strip()
+                spec = sys.intern(m.group(0) + line[m.end():].strip())
+            else:
+                name = line
+                spec = ""
+            out.append((name, spec))
     return out
+
+
+# find_dependency_files() key -> parser for that manifest
+_PARSERS: Dict[str, Callable[[Path], Any]] = {
+    "package_json": parse_package_json,
+    "requirements_txt": parse_requirements_txt,
+}
+
+
+async def parse_all(files: Mapping[str, Optional[Path]]) -> Dict[str, Any]:
+    """
+    Parses every manifest found by find_dependency_files() concurrently in worker threads.
+
+    Returns a dictionary with the same keys, holding the parsed result for each manifest
+    that exists; missing manifests are left out. Wall time is that of the slowest parse
+    rather than their sum.
+    """
+    present = [(key, path) for key, path in files.items() if path is not None and key in _PARSERS]
+    parsed = await asyncio.gather(*(asyncio.to_thread(_PARSERS[key], path) for key, path in present))
+    return {key: result for (key, _), result in zip(present, parsed)}
@@ -0,0 +1,215 @@
+from __future__ import annotations
+import asyncio
+import os
+import time
+import traceback
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import quote
+
+import orjson
+
+TTL = int(os.getenv("MCP_CACHE_TTL", "600"))  # seconds a successful registry response is reused
+NEGATIVE_TTL = 30  # failures expire quickly so a registry outage isn't pinned
+MAXSIZE = 4096  # oldest entries are evicted beyond this many packages
+# seconds a stored response on disk is used without asking the registry at all
+DISK_TTL = int(os.getenv("MCP_CACHE_MAX_AGE", "3600"))
+
+# key -> (stored_at, ok, value); value is the raised exception when ok is False
+_CACHE: Dict[Hashable, Tuple[float, bool, Any]] = {}
+
+# key -> fetch in progress, so concurrent misses for the same key share one request
+_INFLIGHT: Dict[Hashable, asyncio.Future] = {}
+
+
+def _store(key: Hashable, ok: bool, value: Any) -> None:
+    now = time.monotonic()
+    _CACHE.pop(key, None)
+    _CACHE[key] = (now, ok, value)
+    # Entries are in storage order, so expired ones collect at the front; drop them
+    # along with anything beyond MAXSIZE
+    while _CACHE:
+        oldest = next(iter(_CACHE))
+        stored_at, oldest_ok, _ = _CACHE[oldest]
+        if len(_CACHE) <= MAXSIZE and now - stored_at < (TTL if oldest_ok else NEGATIVE_TTL):
+            break
+        del _CACHE[oldest]
+
+
+async def _fetch_and_store(key: Hashable, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    try:
+        value = await coro_factory()
+    except Exception as e:
+        # The cached exception outlives the request; drop the finished frames' locals
+        # (e.g. a stale registry payload) so the entry doesn't pin them in memory
+        traceback.clear_frames(e.__traceback__)
+        _store(key, False, e)
+        raise
+    _store(key, True, value)
+    return value
+
+
+async def get_or_fetch(key: Hashable, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Returns the cached value for key if it is still fresh, otherwise awaits
+    coro_factory() and caches the outcome.
+
+    Successful results are kept for TTL seconds. Exceptions are cached for
+    NEGATIVE_TTL seconds and re-raised on hit, so callers see the same error
+    handling they would get from a live request. Concurrent misses for the same
+    key await a single coro_factory() call instead of each starting their own.
+    """
+    entry = _CACHE.get(key)
+    if entry is not None:
+        stored_at, ok, value = entry
+        if time.monotonic() - stored_at < (TTL if ok else NEGATIVE_TTL):
+            if ok:
+                return value
+            # Raise without the previous traceback, or each hit would extend the same one
+            raise value.with_traceback(None)
+        del _CACHE[key]
+
+    fut = _INFLIGHT.get(key)
+    if fut is None:
+        fut = asyncio.ensure_future(_fetch_and_store(key, coro_factory))
+        _INFLIGHT[key] = fut
+        fut.add_done_callback(lambda _f: _INFLIGHT.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the fetch for the others
+    return await asyncio.shield(fut)
+
+
+def clear() -> None:
+    """
+    Drops every cached entry.
+    """
+    _CACHE.clear()
+
+
+try:
+    _TOOL_VERSION = version("mcp-dependency-health")
+except PackageNotFoundError:
+    _TOOL_VERSION = "dev"
+
+
+def cache_dir() -> Path:
+    """
+    Root directory of the on-disk registry response cache.
+
+    Defaults to ~/.cache/mcp-dependency-health and can be overridden with MCP_CACHE_DIR.
+    """
+    override = os.getenv("MCP_CACHE_DIR")
+    return Path(override) if override else Path.home() / ".cache" / "mcp-dependency-health"
+
+
+def _response_path(ecosystem: str, name: str) -> Path:
+    # Scoped npm names contain "/", so the name is percent-encoded into a single file name.
+    # The tool version is part of the name so a schema change invalidates old entries.
+    return cache_dir() / ecosystem / f"{quote(name, safe='')}-{_TOOL_VERSION}.json"
+
+
+MAX_FILE_AGE = 30 * 24 * 3600  # stored responses untouched for this long are deleted
+_TMP_FILE_AGE = 3600  # leftover temp files from interrupted writes are deleted after this long
+
+# Cache directories already swept by this process
+_SWEPT: set = set()
+
+
+def _sweep(root: Path) -> None:
+    """
+    Deletes files other tool versions left behind, stale temp files and long-unused responses.
+    """
+    suffix = f"-{_TOOL_VERSION}.json"
+    now = time.time()
+    try:
+        namespaces = [d for d in os.scandir(root) if d.is_dir()]
+    except OSError:
+        return
+    for namespace in namespaces:
+        try:
+            entries = list(os.scandir(namespace.path))
+        except OSError:
+            continue
+        for e in entries:
+            try:
+                age = now - e.stat().st_mtime
+                if e.name.endswith(".tmp"):
+                    stale = age > _TMP_FILE_AGE
+                else:
+                    stale = not e.name.endswith(suffix) or age > MAX_FILE_AGE
+                if stale:
+                    os.unlink(e.path)
+            except OSError:
+                pass
+
+
+def _read_response(path: Path) -> Optional[dict]:
+    root = cache_dir()
+    if root not in _SWEPT:
+        _SWEPT.add(root)
+        _sweep(root)
+    try:
+        with open(path, "rb") as f:
+            entry = orjson.loads(f.read())
+            # The file's mtime is when the response was last fetched or revalidated
+            fetched_at = os.fstat(f.fileno()).st_mtime
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(entry, dict) or "payload" not in entry:
+        return None
+    entry["fetched_at"] = fetched_at
+    return entry
+
+
+def _write_response(path: Path, entry: dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(orjson.dumps(entry))
+        os.replace(tmp, path)
+    except OSError:
+        # The disk cache is best-effort; a read-only or full disk must not fail the check
+        pass
+
+
+async def load_response(ecosystem: str, name: str) -> Optional[dict]:
+    """
+    Loads a stored registry response for a package.
+
+    Returns a dict with keys 'etag', 'last_modified', 'fetched_at' and 'payload',
+    or None if nothing usable is stored. The first load in a process also sweeps
+    the cache directory of files from other tool versions and long-unused entries.
+    """
+    return await asyncio.to_thread(_read_response, _response_path(ecosystem, name))
+
+
+def is_fresh(entry: dict) -> bool:
+    """
+    Whether a stored response is recent enough to be used without revalidating it.
+    """
+    return time.time() - entry.get("fetched_at", 0) < DISK_TTL
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+async def touch_response(ecosystem: str, name: str) -> None:
+    """
+    Marks a stored response as just revalidated (after a 304) without rewriting it.
+    """
+    await asyncio.to_thread(_touch, _response_path(ecosystem, name))
+
+
+async def store_response(ecosystem: str, name: str, entry: dict) -> None:
+    """
+    Persists a registry response for a package, replacing any previous entry atomically.
+
+    entry holds 'etag', 'last_modified' and 'payload'; the file's write time serves as
+    its 'fetched_at'. Callers should store only the fields they read, not whole registry
+    documents.
+    """
+    await asyncio.to_thread(_write_response, _response_path(ecosystem, name), entry)
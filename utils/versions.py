@@ -1,8 +1,73 @@
 from __future__ import annotations
 import re
+import sys
+from functools import lru_cache
+from typing import Iterable, List, Tuple, Union
 from packaging.version import Version, InvalidVersion
 from packaging.specifiers import SpecifierSet, InvalidSpecifier
 
+# x.y.z triple: fullmatch() for exact versions, search() inside ranges such as "^17.0.2"
+_SEMVER = re.compile(r"\d+\.\d+\.\d+")
+
+# Every PEP 440 pre/dev spelling (a, b, c, rc, alpha, beta, pre, preview, dev) and npm's "-"
+# contains one of these, so a version without any of them cannot be a prerelease
+_PRERELEASE_CHARS = frozenset("-abcdrABCDR")
+
+# First characters of Python-style specifiers (==, !=, >=, <=, >, <); "~=" is checked separately
+_PY_SPEC_CHARS = frozenset("=!<>")
+
+# Leading major[.minor[.patch]] of an npm range base such as "18.2.0" or "4.1"
+_NUM3 = re.compile(r"(\d+)(?:\.(\d+))?(?:\.(\d+))?")
+
+
+@lru_cache(maxsize=2048)
+def _cached_version(ver: str) -> Version:
+    """
+    Parses a version string once per process; packaging's Version() runs a regex on every call.
+
+    Raises InvalidVersion like Version() does (failures are not cached).
+    """
+    return Version(ver)
+
+
+def _plain_triple(ver: str) -> tuple[int, int, int] | None:
+    """
+    Returns (major, minor, patch) for a plain "x.y.z" release, else None.
+
+    For such versions integer tuple order is exactly PEP 440 / SemVer order, so
+    comparisons can skip packaging entirely.
+    """
+    if not _SEMVER.fullmatch(ver):
+        return None
+    major, minor, patch = ver.split(".")
+    return (int(major), int(minor), int(patch))
+
+
+@lru_cache(maxsize=2048)
+def _cached_specifier(spec: str) -> SpecifierSet:
+    """
+    Parses a specifier string once per process; common specs like ">=1.0" repeat across packages.
+
+    Raises InvalidSpecifier like SpecifierSet() does (failures are not cached).
+    """
+    return SpecifierSet(spec)
+
+
+def _spec_contains(spec: str, latest: str) -> bool:
+    """
+    Whether latest satisfies spec, prereleases included.
+
+    Raises InvalidSpecifier for a bad spec. A latest that isn't PEP 440 (the registry's
+    "unknown" placeholder, SemVer-only prereleases) satisfies nothing, as it would with
+    SpecifierSet.contains() on the raw string, so the spec isn't blamed for it.
+    """
+    specifier = _cached_specifier(spec)
+    try:
+        version = _cached_version(latest)
+    except InvalidVersion:
+        return False
+    return specifier.contains(version, prereleases=True)
+
 
 def is_prerelease(ver: str) -> bool:
     """
@@ -11,23 +76,27 @@ def is_prerelease(ver: str) -> bool:
     Uses Python's packaging library for PEP 440 versions, and falls back to
     checking for hyphens (e.g., "1.2.3-beta.1") for npm-style prereleases.
     """
+    if _PRERELEASE_CHARS.isdisjoint(ver):
+        return False
     try:
-        return Version(ver).is_prerelease
+        return _cached_version(ver).is_prerelease
     except InvalidVersion:
         # npm-like prerelease: 1.2.3-beta.1
         return "-" in ver
 
 
+@lru_cache(maxsize=4096)
 def normalize_possible_version(raw: str) -> str:
     """
     Try to extract a "x.y.z" from strings like "^17.0.2" or "~4.1.0".
     If not found, return raw.
     """
     raw = raw.strip()
-    m = re.search(r"\d+\.\d+\.\d+", raw)
+    m = _SEMVER.search(raw)
     return m.group(0) if m else raw
 
 
+@lru_cache(maxsize=4096)
 def convert_npm_range_to_specifier(npm_range: str) -> str | None:
     """
     Converts npm-style version ranges to Python packaging specifier format.
@@ -41,36 +110,35 @@ def convert_npm_range_to_specifier(npm_range: str) -> str | None:
     Returns None if the range cannot be converted.
     """
     npm_range = npm_range.strip()
+    c = npm_range[:1]
     
     # Handle caret (^) ranges: ^18.0.0 → >=18.0.0,<19.0.0
-    if npm_range.startswith("^"):
+    if c == "^":
         base_version = npm_range[1:].strip()
-        try:
-            v = Version(base_version)
-            # For ^x.y.z, allow >=x.y.z <(x+1).0.0
-            next_major = f"{v.major + 1}.0.0"
-            return f">={base_version},<{next_major}"
-        except InvalidVersion:
+        m = _NUM3.match(base_version)
+        if not m:
             return None
+        # For ^x.y.z, allow >=x.y.z <(x+1).0.0
+        return f">={base_version},<{int(m.group(1)) + 1}.0.0"
     
     # Handle tilde (~) ranges: ~18.0.0 → >=18.0.0,<18.1.0
-    if npm_range.startswith("~"):
+    if c == "~":
         base_version = npm_range[1:].strip()
-        try:
-            v = Version(base_version)
-            # For ~x.y.z, allow >=x.y.z <x.(y+1).0
-            if len(v.release) >= 2:
-                next_minor = f"{v.major}.{v.minor + 1}.0"
-            else:
-                next_minor = f"{v.major + 1}.0.0"
-            return f">={base_version},<{next_minor}"
-        except InvalidVersion:
+        m = _NUM3.match(base_version)
+        if not m:
             return None
+        major, minor = m.group(1, 2)
+        # For ~x.y.z, allow >=x.y.z <x.(y+1).0
+        if minor is not None:
+            next_minor = f"{int(major)}.{int(minor) + 1}.0"
+        else:
+            next_minor = f"{int(major) + 1}.0.0"
+        return f">={base_version},<{next_minor}"
     
     # Handle standalone >= or <= (npm style, not Python style)
     # These are already compatible with Python specifiers, but we need to ensure
     # they're not being treated as Python-style (which would have been caught earlier)
-    if npm_range.startswith((">=", "<=", ">", "<")):
+    if c == ">" or c == "<":
         # Already in Python specifier format, return as-is
         return npm_range
     
@@ -87,33 +155,80 @@ def is_up_to_date(current_spec: str, latest: str) -> tuple[bool, str | None]:
       - else fallback to extracted x.y.z compare
     """
     cs = current_spec.strip()
+    # Pinned to exactly the latest release (the common case): nothing to parse
+    if cs == latest:
+        return (True, None)
+    if not cs:
+        return (False, "could not parse current version; marking unknown")
+    # Interned keys let the cache's tuple comparison succeed on identity
+    return _is_up_to_date_cached(sys.intern(cs), latest)
 
-    # exact numeric like 1.2.3
-    if re.fullmatch(r"\d+\.\d+\.\d+", cs):
-        return (Version(cs) >= Version(latest), None)
 
-    # Python requirements style: ==1.2.3 / >=1.0 / ~=1.0
-    if cs.startswith(("==", ">=", "<=", "~=", "!=", ">", "<")):
-        try:
-            spec = SpecifierSet(cs)
-            ok = spec.contains(latest, prereleases=True)
-            return (ok, None)
-        except (InvalidSpecifier, InvalidVersion):
-            pass
+def is_up_to_date_batch(pairs: Iterable[Tuple[str, str]]) -> List[Union[Tuple[bool, str | None], Exception]]:
+    """
+    Runs is_up_to_date over (current_spec, latest) pairs and returns the results in input order.
+
+    Each distinct pair is evaluated once. Like asyncio.gather(return_exceptions=True), a pair
+    whose check raises yields the exception in its slot instead of aborting the batch.
+    """
+    seen: dict = {}
+    out: List[Union[Tuple[bool, str | None], Exception]] = []
+    for pair in pairs:
+        res = seen.get(pair)
+        if res is None:
+            try:
+                res = is_up_to_date(*pair)
+            except Exception as e:
+                res = e
+            seen[pair] = res
+        out.append(res)
+    return out
+
 
-    # npm-style ranges: ^18.0.0, ~18.0.0, >=18.0.0 (standalone)
-    npm_spec = convert_npm_range_to_specifier(cs)
-    if npm_spec:
+@lru_cache(maxsize=4096)
+def _is_up_to_date_cached(cs: str, latest: str) -> tuple[bool, str | None]:
+    """
+    is_up_to_date on a stripped spec; the same (spec, latest) pairs recur across
+    manifests and repeated checks, so results are memoized.
+    """
+    # Dispatch once on the first character instead of re-scanning prefixes in each branch
+    c = cs[:1]
+
+    # exact numeric like 1.2.3 (ranges start with an operator, so skip the regex for them)
+    if c.isdigit():
+        cur = _plain_triple(cs)
+        if cur:
+            lat = _plain_triple(latest)
+            if lat:
+                return (cur >= lat, None)
+            return (_cached_version(cs) >= _cached_version(latest), None)
+
+    # Python requirements style: ==1.2.3 / >=1.0 / ~=1.0 (also npm's standalone >= / <,
+    # which convert_npm_range_to_specifier would only pass through unchanged)
+    elif c in _PY_SPEC_CHARS or cs.startswith("~="):
         try:
-            spec = SpecifierSet(npm_spec)
-            ok = spec.contains(latest, prereleases=True)
-            return (ok, "npm range detected; checked if latest satisfies range")
-        except (InvalidSpecifier, InvalidVersion):
+            return (_spec_contains(cs, latest), None)
+        except InvalidSpecifier:
             pass
 
+    # npm-style ranges: ^18.0.0, ~18.0.0
+    elif c == "^" or c == "~":
+        # Plain x.y.z base and latest: compare integer triples instead of building a SpecifierSet
+        base = _plain_triple(cs[1:].strip())
+        lat = _plain_triple(latest) if base else None
+        if lat:
+            upper = (base[0] + 1, 0, 0) if c == "^" else (base[0], base[1] + 1, 0)
+            return (base <= lat < upper, "npm range detected; checked if latest satisfies range")
+        npm_spec = convert_npm_range_to_specifier(cs)
+        if npm_spec:
+            try:
+                return (_spec_contains(npm_spec, latest), "npm range detected; checked if latest satisfies range")
+            except InvalidSpecifier:
+                pass
+
     # fallback: try extract version and compare (legacy behavior)
     cur_v = normalize_possible_version(cs)
     try:
-        return (Version(cur_v) >= Version(latest), "range detected; compared by extracted version")
+        return (_cached_version(cur_v) >= _cached_version(latest), "range detected; compared by extracted version")
     except InvalidVersion:
         return (False, "could not parse current version; marking unknown")